@@ -1,40 +1,44 @@
 #!/usr/bin/env python3
 """Quick check to see if there are any favorites in the 162APPLE folder."""
 
-import sqlite3
-from pathlib import Path
+from db_discovery import DB_PATH, open_connection
 
-DB_PATH = Path(__file__).parent / "teszt" / "Photos-20251206_2140.sqlite"
+# Match the folder as the trailing path segment (e.g. DCIM/162APPLE) rather than anywhere in the string;
+# LIKE keeps the match case-insensitive and RTRIM tolerates a trailing slash
+FOLDER_MATCH = "('/' || RTRIM(ZDIRECTORY, '/') LIKE '%/162APPLE')"
 
-with sqlite3.connect(DB_PATH) as conn:
-    cursor = conn.cursor()
-
-    # Count favorites in 162APPLE
-    cursor.execute("""
-        SELECT COUNT(*) FROM ZASSET
-        WHERE ZFAVORITE = 1 AND ZTRASHEDSTATE = 0 AND ZDIRECTORY LIKE '%162APPLE%'
-    """)
-    count = cursor.fetchone()[0]
-    print(f"Favorites in 162APPLE: {count}")
-
-    # Show some favorites from 162APPLE if any
-    cursor.execute("""
-        SELECT ZFILENAME, ZDIRECTORY, ZFAVORITE FROM ZASSET
-        WHERE ZFAVORITE = 1 AND ZTRASHEDSTATE = 0 AND ZDIRECTORY LIKE '%162APPLE%'
-        LIMIT 10
-    """)
-    rows = cursor.fetchall()
-    for row in rows:
-        print(f"  {row[0]} in {row[1]}")
-
-    # What directories have favorites?
-    print("\nDirectories with favorites:")
-    cursor.execute("""
-        SELECT ZDIRECTORY, COUNT(*) as cnt FROM ZASSET
+# One pass over the live favorites feeds all three reports; rows are tagged by report
+FAVORITES_REPORT = f"""
+    WITH fav AS (
+        SELECT ZFILENAME, ZDIRECTORY, {FOLDER_MATCH} AS IN_FOLDER
+        FROM ZASSET
         WHERE ZFAVORITE = 1 AND ZTRASHEDSTATE = 0
+    )
+    SELECT 'count', NULL, COUNT(*) FROM fav WHERE IN_FOLDER
+    UNION ALL
+    SELECT * FROM (SELECT 'sample', ZFILENAME, ZDIRECTORY FROM fav WHERE IN_FOLDER LIMIT 10)
+    UNION ALL
+    SELECT * FROM (
+        SELECT 'directory', ZDIRECTORY, COUNT(*) AS cnt FROM fav
         GROUP BY ZDIRECTORY
         ORDER BY cnt DESC
         LIMIT 20
-    """)
-    for row in cursor.fetchall():
-        print(f"  {row[0]}: {row[1]}")
+    )
+"""
+
+with open_connection(DB_PATH) as conn:
+    rows = conn.execute(FAVORITES_REPORT).fetchall()
+
+count = next(row[2] for row in rows if row[0] == 'count')
+print(f"Favorites in 162APPLE: {count}")
+
+# Show some favorites from 162APPLE if any
+for row in rows:
+    if row[0] == 'sample':
+        print(f"  {row[1]} in {row[2]}")
+
+# What directories have favorites?
+print("\nDirectories with favorites:")
+for row in rows:
+    if row[0] == 'directory':
+        print(f"  {row[1]}: {row[2]}")
@@ -1,11 +1,49 @@
 #!/usr/bin/env python3
 """Database discovery script for iOS 18 Photos.sqlite schema."""
 
+import re
 import sqlite3
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
+from typing import Optional
 
 DB_PATH = Path(__file__).parent / "teszt" / "Photos-20251206_2140.sqlite"
 
+# Read-only tuning: 64 MB page cache, 256 MB memory map, in-memory temp tables
+READ_PRAGMAS = """
+    PRAGMA query_only = 1;
+    PRAGMA cache_size = -65536;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA temp_store = MEMORY;
+"""
+
+# Table name fragments that mark candidates for description storage
+DESCRIPTION_TABLE_MARKERS = ('DESCRIPTION', 'EXTENDED', 'ADDITIONAL')
+
+# ZASSET column name fragments worth highlighting, in display order
+ZASSET_PATTERNS = ('FAVORITE', 'DESCRIPTION', 'FILENAME', 'DIRECTORY', 'TITLE', 'CAPTION', 'Z_PK', 'ZADDITIONAL')
+ZASSET_PATTERN_RE = re.compile('|'.join(map(re.escape, ZASSET_PATTERNS)), re.IGNORECASE)
+
+
+def open_connection(db_path: Path) -> sqlite3.Connection:
+    """Open the database once with the read-only PRAGMAs applied up front.
+
+    The snapshot is opened as a read-only URI. Without a -wal sidecar it is
+    also immutable, so SQLite skips file locking; a copied WAL still holds
+    committed rows, so then the plain read-only mode lets SQLite read it.
+    """
+    uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+    has_wal = Path(f"{db_path}-wal").exists()
+    if not has_wal:
+        uri += "&immutable=1"
+    conn = sqlite3.connect(uri, uri=True, isolation_level=None, cached_statements=256)
+    if not has_wal:
+        # A read-only connection can't switch a WAL database out of WAL mode
+        conn.execute("PRAGMA journal_mode = OFF")
+    conn.executescript(READ_PRAGMAS)
+    return conn
+
 
 def print_separator(title: str) -> None:
     print(f"\n{'=' * 60}")
@@ -15,53 +53,103 @@ def print_separator(title: str) -> None:
 
 def get_all_tables(cursor: sqlite3.Cursor) -> list[str]:
     cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-    return [row[0] for row in cursor.fetchall()]
+    return [row[0] for row in cursor]
+
+
+def truncate_sql(column: str, width: int) -> str:
+    """SQL expression shortening a text column to `width` characters plus '...'.
+
+    The result is returned as raw UTF-8 bytes; decode it with decode_sample().
+    """
+    return f"CAST(substr({column}, 1, {width}) || CASE WHEN length({column}) > {width} THEN '...' ELSE '' END AS BLOB)"
+
+
+def decode_sample(value: Optional[bytes]) -> Optional[str]:
+    # Decoding only the truncated sample; malformed UTF-8 is replaced instead of aborting the query
+    return value.decode('utf-8', 'replace') if value is not None else None
+
+
+def is_description_table(table: str) -> bool:
+    return any(marker in table.upper() for marker in DESCRIPTION_TABLE_MARKERS)
+
 
+def load_table_columns(cursor: sqlite3.Cursor, tables: list[str]) -> dict[str, list[tuple[str, str]]]:
+    """Fetch the columns of several tables with a single query."""
+    placeholders = ", ".join("?" * len(tables))
+    cursor.execute(f"""
+        SELECT m.name, p.name, p.type
+        FROM sqlite_master m
+        JOIN pragma_table_xinfo(m.name) p
+        WHERE m.type = 'table' AND m.name IN ({placeholders})
+        ORDER BY m.name, p.cid
+    """, tables)
+    schema: dict[str, list[tuple[str, str]]] = {}
+    for table, col_name, col_type in cursor:
+        schema.setdefault(table, []).append((col_name, col_type))
+    return schema
 
-def get_table_columns(cursor: sqlite3.Cursor, table: str) -> list[tuple[str, str]]:
-    cursor.execute(f"PRAGMA table_info({table})")
-    return [(row[1], row[2]) for row in cursor.fetchall()]
+
+def get_foreign_keys(cursor: sqlite3.Cursor, table: str, target: str) -> list[tuple[str, str]]:
+    """Declared foreign keys of `table` pointing at `target`, as (column, referenced column) pairs."""
+    cursor.execute('SELECT "from", "to" FROM pragma_foreign_key_list(?) WHERE "table" = ?', (table, target))
+    return [(row[0], row[1] or 'Z_PK') for row in cursor]
+
+
+def get_indexed_columns(cursor: sqlite3.Cursor, table: str) -> list[str]:
+    cursor.execute("""
+        SELECT DISTINCT ii.name
+        FROM pragma_index_list(?) il
+        JOIN pragma_index_info(il.name) ii
+        WHERE ii.name IS NOT NULL
+        ORDER BY ii.name
+    """, (table,))
+    return [row[0] for row in cursor]
 
 
 def search_column_in_tables(cursor: sqlite3.Cursor, column_pattern: str) -> None:
     """Search for columns matching a pattern across all tables."""
     print_separator(f"Tables containing '{column_pattern}' columns")
-    tables = get_all_tables(cursor)
-    for table in tables:
-        columns = get_table_columns(cursor, table)
-        matching = [c for c in columns if column_pattern.upper() in c[0].upper()]
-        if matching:
-            print(f"\n{table}:")
-            for col_name, col_type in matching:
-                print(f"  - {col_name} ({col_type})")
+    escaped = column_pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    cursor.execute("""
+        SELECT m.name, p.name, p.type
+        FROM sqlite_master m
+        JOIN pragma_table_info(m.name) p
+        WHERE m.type = 'table' AND p.name LIKE ? ESCAPE '\\'
+        ORDER BY m.name, p.cid
+    """, (f"%{escaped}%",))
+    for table, matching in groupby(cursor, key=itemgetter(0)):
+        print(f"\n{table}:")
+        for _, col_name, col_type in matching:
+            print(f"  - {col_name} ({col_type})")
 
 
-def explore_zasset(cursor: sqlite3.Cursor) -> None:
+def explore_zasset(schema: dict[str, list[tuple[str, str]]]) -> None:
     """Explore ZASSET table structure."""
     print_separator("ZASSET Table Structure")
-    columns = get_table_columns(cursor, "ZASSET")
+    columns = schema.get("ZASSET", [])
     print(f"Total columns: {len(columns)}\n")
 
-    # Show columns related to favorites, descriptions, filenames
-    interesting_patterns = ['FAVORITE', 'DESCRIPTION', 'FILENAME', 'DIRECTORY', 'TITLE', 'CAPTION', 'Z_PK', 'ZADDITIONAL']
-    for pattern in interesting_patterns:
-        matching = [c for c in columns if pattern.upper() in c[0].upper()]
+    # Show columns related to favorites, descriptions, filenames; one regex pass buckets every column
+    buckets: dict[str, list[tuple[str, str]]] = {pattern: [] for pattern in ZASSET_PATTERNS}
+    for col_name, col_type in columns:
+        for pattern in {m.group(0).upper() for m in ZASSET_PATTERN_RE.finditer(col_name)}:
+            buckets[pattern].append((col_name, col_type))
+
+    for pattern, matching in buckets.items():
         if matching:
             print(f"Columns matching '{pattern}':")
             for col_name, col_type in matching:
                 print(f"  - {col_name} ({col_type})")
 
 
-def explore_description_tables(cursor: sqlite3.Cursor) -> None:
+def explore_description_tables(schema: dict[str, list[tuple[str, str]]]) -> None:
     """Look for tables that might contain descriptions."""
     print_separator("Tables potentially containing descriptions")
 
-    tables = get_all_tables(cursor)
-    desc_tables = [t for t in tables if 'DESCRIPTION' in t.upper() or 'EXTENDED' in t.upper() or 'ADDITIONAL' in t.upper()]
-
-    for table in desc_tables:
+    for table, columns in schema.items():
+        if not is_description_table(table):
+            continue
         print(f"\n{table}:")
-        columns = get_table_columns(cursor, table)
         for col_name, col_type in columns:
             print(f"  - {col_name} ({col_type})")
 
@@ -82,16 +170,15 @@ def sample_favorites(cursor: sqlite3.Cursor) -> None:
         print(f"  Z_PK={row[0]}, FILE={row[1]}, DIR={row[2]}, FAV={row[3]}, TRASH={row[4]}")
 
 
-def explore_zassetdescription(cursor: sqlite3.Cursor) -> None:
+def explore_zassetdescription(cursor: sqlite3.Cursor, schema: dict[str, list[tuple[str, str]]]) -> None:
     """Explore ZASSETDESCRIPTION table if it exists."""
     print_separator("ZASSETDESCRIPTION Table Exploration")
 
-    tables = get_all_tables(cursor)
-    if 'ZASSETDESCRIPTION' not in tables:
+    if 'ZASSETDESCRIPTION' not in schema:
         print("ZASSETDESCRIPTION table does NOT exist!")
         return
 
-    columns = get_table_columns(cursor, 'ZASSETDESCRIPTION')
+    columns = schema['ZASSETDESCRIPTION']
     print("Columns:")
     for col_name, col_type in columns:
         print(f"  - {col_name} ({col_type})")
@@ -102,53 +189,66 @@ def explore_zassetdescription(cursor: sqlite3.Cursor) -> None:
     print(f"\nRows with non-empty ZLONGDESCRIPTION: {count}")
 
     if count > 0:
-        cursor.execute("""
-            SELECT Z_PK, ZASSETATTRIBUTES, ZLONGDESCRIPTION
+        cursor.execute(f"""
+            SELECT Z_PK, ZASSETATTRIBUTES, {truncate_sql('ZLONGDESCRIPTION', 50)}
             FROM ZASSETDESCRIPTION
             WHERE ZLONGDESCRIPTION IS NOT NULL AND ZLONGDESCRIPTION != ''
             LIMIT 5
         """)
         print("\nSample descriptions:")
-        for row in cursor.fetchall():
-            desc = row[2][:50] + "..." if len(row[2]) > 50 else row[2]
-            print(f"  Z_PK={row[0]}, ZASSETATTRIBUTES={row[1]}, DESC='{desc}'")
+        for row in cursor:
+            print(f"  Z_PK={row[0]}, ZASSETATTRIBUTES={row[1]}, DESC='{decode_sample(row[2])}'")
 
 
-def explore_zadditionalassetattributes(cursor: sqlite3.Cursor) -> None:
+def explore_zadditionalassetattributes(schema: dict[str, list[tuple[str, str]]]) -> None:
     """Explore ZADDITIONALASSETATTRIBUTES table."""
     print_separator("ZADDITIONALASSETATTRIBUTES Table Exploration")
 
-    tables = get_all_tables(cursor)
-    if 'ZADDITIONALASSETATTRIBUTES' not in tables:
+    if 'ZADDITIONALASSETATTRIBUTES' not in schema:
         print("ZADDITIONALASSETATTRIBUTES table does NOT exist!")
         return
 
-    columns = get_table_columns(cursor, 'ZADDITIONALASSETATTRIBUTES')
+    columns = schema['ZADDITIONALASSETATTRIBUTES']
     print(f"Total columns: {len(columns)}")
 
     # Show relevant columns
-    relevant = [c for c in columns if any(p in c[0].upper() for p in ['Z_PK', 'ZASSET', 'TITLE', 'DESCRIPTION', 'CAPTION'])]
+    relevant_patterns = ['Z_PK', 'ZASSET', 'TITLE', 'DESCRIPTION', 'CAPTION']
+    relevant = []
+    for col_name, col_type in columns:
+        upper_name = col_name.upper()
+        if any(p in upper_name for p in relevant_patterns):
+            relevant.append((col_name, col_type))
     print("\nRelevant columns:")
     for col_name, col_type in relevant:
         print(f"  - {col_name} ({col_type})")
 
 
-def find_join_path(cursor: sqlite3.Cursor) -> None:
+def find_join_path(cursor: sqlite3.Cursor, tables: frozenset[str]) -> None:
     """Figure out how to join ZASSET to ZASSETDESCRIPTION."""
     print_separator("Finding JOIN path: ZASSET -> ZASSETDESCRIPTION")
 
-    tables = get_all_tables(cursor)
-
     # Check if ZASSETDESCRIPTION.ZASSETATTRIBUTES links to ZADDITIONALASSETATTRIBUTES.Z_PK
     if 'ZASSETDESCRIPTION' in tables and 'ZADDITIONALASSETATTRIBUTES' in tables:
+        # Schema metadata answers the question without reading any rows, if the keys are declared
+        foreign_keys = get_foreign_keys(cursor, 'ZASSETDESCRIPTION', 'ZADDITIONALASSETATTRIBUTES')
+        if foreign_keys:
+            for col_name, ref_col in foreign_keys:
+                print(f"Foreign key: ZASSETDESCRIPTION.{col_name} -> ZADDITIONALASSETATTRIBUTES.{ref_col}")
+            return
+
+        # Core Data does not declare foreign keys, but it indexes its relationship columns
+        indexed = get_indexed_columns(cursor, 'ZASSETDESCRIPTION')
+        if indexed:
+            print(f"Indexed ZASSETDESCRIPTION columns: {', '.join(indexed)}")
+
         # Get a sample to understand the relationship
-        cursor.execute("""
+        cursor.execute(f"""
             SELECT
                 ad.Z_PK as AAA_PK,
                 ad.ZASSET as AAA_ZASSET,
                 d.Z_PK as DESC_PK,
                 d.ZASSETATTRIBUTES as DESC_ZASSETATTRIBUTES,
-                d.ZLONGDESCRIPTION
+                {truncate_sql('d.ZLONGDESCRIPTION', 40)}
             FROM ZADDITIONALASSETATTRIBUTES ad
             LEFT JOIN ZASSETDESCRIPTION d ON d.ZASSETATTRIBUTES = ad.Z_PK
             WHERE d.ZLONGDESCRIPTION IS NOT NULL AND d.ZLONGDESCRIPTION != ''
@@ -159,100 +259,111 @@ def find_join_path(cursor: sqlite3.Cursor) -> None:
             print("Join via ZASSETDESCRIPTION.ZASSETATTRIBUTES = ZADDITIONALASSETATTRIBUTES.Z_PK works!")
             print("\nSample joined data:")
             for row in rows:
-                desc = row[4][:40] + "..." if row[4] and len(row[4]) > 40 else row[4]
-                print(f"  AAA.Z_PK={row[0]}, AAA.ZASSET={row[1]}, DESC.Z_PK={row[2]}, DESC='{desc}'")
-
-
-def test_full_query(cursor: sqlite3.Cursor) -> None:
+                print(f"  AAA.Z_PK={row[0]}, AAA.ZASSET={row[1]}, DESC.Z_PK={row[2]}, DESC='{decode_sample(row[4])}'")
+
+
+# iOS 18: ZASSET.ZADDITIONALATTRIBUTES -> ZADDITIONALASSETATTRIBUTES.Z_PK
+# ZADDITIONALASSETATTRIBUTES.ZASSETDESCRIPTION -> ZASSETDESCRIPTION.Z_PK
+# The integer favorite test runs first; "<> ''" is already false for NULL descriptions
+FULL_QUERY = f"""
+    SELECT
+        ZASSET.Z_PK,
+        ZASSET.ZFILENAME,
+        ZASSET.ZDIRECTORY,
+        ZASSET.ZFAVORITE,
+        ZASSET.ZTRASHEDSTATE,
+        ZADDITIONALASSETATTRIBUTES.Z_PK as AAA_PK,
+        ZADDITIONALASSETATTRIBUTES.ZASSETDESCRIPTION as AAA_DESC_FK,
+        {truncate_sql('ZASSETDESCRIPTION.ZLONGDESCRIPTION', 30)}
+    FROM ZASSET
+    LEFT JOIN ZADDITIONALASSETATTRIBUTES ON ZASSET.ZADDITIONALATTRIBUTES = ZADDITIONALASSETATTRIBUTES.Z_PK
+    LEFT JOIN ZASSETDESCRIPTION ON ZADDITIONALASSETATTRIBUTES.ZASSETDESCRIPTION = ZASSETDESCRIPTION.Z_PK
+    WHERE ZASSET.ZTRASHEDSTATE = 0
+      AND (ZASSET.ZFAVORITE = 1 OR ZASSETDESCRIPTION.ZLONGDESCRIPTION <> '')
+    LIMIT 20
+"""
+
+# Older schema: ZASSETDESCRIPTION.ZASSETATTRIBUTES -> ZADDITIONALASSETATTRIBUTES.Z_PK
+FULL_QUERY_LEGACY = f"""
+    SELECT
+        ZASSET.Z_PK,
+        ZASSET.ZFILENAME,
+        ZASSET.ZDIRECTORY,
+        ZASSET.ZFAVORITE,
+        ZASSET.ZTRASHEDSTATE,
+        ZADDITIONALASSETATTRIBUTES.Z_PK as AAA_PK,
+        {truncate_sql('ZASSETDESCRIPTION.ZLONGDESCRIPTION', 30)}
+    FROM ZASSET
+    LEFT JOIN ZADDITIONALASSETATTRIBUTES ON ZASSET.ZADDITIONALATTRIBUTES = ZADDITIONALASSETATTRIBUTES.Z_PK
+    LEFT JOIN ZASSETDESCRIPTION ON ZASSETDESCRIPTION.ZASSETATTRIBUTES = ZADDITIONALASSETATTRIBUTES.Z_PK
+    WHERE ZASSET.ZTRASHEDSTATE = 0
+      AND (ZASSET.ZFAVORITE = 1 OR ZASSETDESCRIPTION.ZLONGDESCRIPTION <> '')
+    LIMIT 20
+"""
+
+
+def test_full_query(cursor: sqlite3.Cursor, schema: dict[str, list[tuple[str, str]]]) -> None:
     """Test the full query to get favorites and descriptions."""
     print_separator("Testing FULL QUERY: ZASSET + ZADDITIONALASSETATTRIBUTES + ZASSETDESCRIPTION")
 
-    # iOS 18: ZASSET.ZADDITIONALATTRIBUTES -> ZADDITIONALASSETATTRIBUTES.Z_PK
-    # ZADDITIONALASSETATTRIBUTES.ZASSETDESCRIPTION -> ZASSETDESCRIPTION.Z_PK
-    query = """
-        SELECT
-            ZASSET.Z_PK,
-            ZASSET.ZFILENAME,
-            ZASSET.ZDIRECTORY,
-            ZASSET.ZFAVORITE,
-            ZASSET.ZTRASHEDSTATE,
-            ZADDITIONALASSETATTRIBUTES.Z_PK as AAA_PK,
-            ZADDITIONALASSETATTRIBUTES.ZASSETDESCRIPTION as AAA_DESC_FK,
-            ZASSETDESCRIPTION.ZLONGDESCRIPTION
-        FROM ZASSET
-        LEFT JOIN ZADDITIONALASSETATTRIBUTES ON ZASSET.ZADDITIONALATTRIBUTES = ZADDITIONALASSETATTRIBUTES.Z_PK
-        LEFT JOIN ZASSETDESCRIPTION ON ZADDITIONALASSETATTRIBUTES.ZASSETDESCRIPTION = ZASSETDESCRIPTION.Z_PK
-        WHERE ZASSET.ZTRASHEDSTATE = 0
-          AND (ZASSET.ZFAVORITE = 1 OR (ZASSETDESCRIPTION.ZLONGDESCRIPTION IS NOT NULL AND ZASSETDESCRIPTION.ZLONGDESCRIPTION != ''))
-        LIMIT 20
-    """
+    # Pick the join from the preloaded columns instead of trying one query and falling back on error
+    aaa_columns = {col_name for col_name, _ in schema.get('ZADDITIONALASSETATTRIBUTES', [])}
+    if 'ZASSETDESCRIPTION' in aaa_columns:
+        query, label = FULL_QUERY, "Query"
+    else:
+        print("ZADDITIONALASSETATTRIBUTES has no ZASSETDESCRIPTION column, using join via ZASSETDESCRIPTION.ZASSETATTRIBUTES...")
+        query, label = FULL_QUERY_LEGACY, "Alternative query"
 
     try:
         cursor.execute(query)
-        rows = cursor.fetchall()
-        print(f"Query returned {len(rows)} row(s)\n")
-
-        for row in rows:
-            desc = row[7][:30] + "..." if row[7] and len(row[7]) > 30 else (row[7] or '<none>')
-            print(f"  Z_PK={row[0]}, FILE={row[1]}, FAV={row[3]}, DESC='{desc}'")
-
     except sqlite3.Error as e:
-        print(f"Query FAILED: {e}")
+        print(f"{label} FAILED: {e}")
+        return
 
-        # Try alternative: ZASSETDESCRIPTION.ZASSETATTRIBUTES -> ZADDITIONALASSETATTRIBUTES.Z_PK
-        print("\nTrying alternative join via ZASSETDESCRIPTION.ZASSETATTRIBUTES...")
-        alt_query = """
-            SELECT
-                ZASSET.Z_PK,
-                ZASSET.ZFILENAME,
-                ZASSET.ZDIRECTORY,
-                ZASSET.ZFAVORITE,
-                ZASSET.ZTRASHEDSTATE,
-                ZADDITIONALASSETATTRIBUTES.Z_PK as AAA_PK,
-                ZASSETDESCRIPTION.ZLONGDESCRIPTION
-            FROM ZASSET
-            LEFT JOIN ZADDITIONALASSETATTRIBUTES ON ZASSET.ZADDITIONALATTRIBUTES = ZADDITIONALASSETATTRIBUTES.Z_PK
-            LEFT JOIN ZASSETDESCRIPTION ON ZASSETDESCRIPTION.ZASSETATTRIBUTES = ZADDITIONALASSETATTRIBUTES.Z_PK
-            WHERE ZASSET.ZTRASHEDSTATE = 0
-              AND (ZASSET.ZFAVORITE = 1 OR (ZASSETDESCRIPTION.ZLONGDESCRIPTION IS NOT NULL AND ZASSETDESCRIPTION.ZLONGDESCRIPTION != ''))
-            LIMIT 20
-        """
-        cursor.execute(alt_query)
-        rows = cursor.fetchall()
-        print(f"Alternative query returned {len(rows)} row(s)\n")
+    rows = cursor.fetchall()
+    print(f"{label} returned {len(rows)} row(s)\n")
 
-        for row in rows:
-            desc = row[6][:30] + "..." if row[6] and len(row[6]) > 30 else (row[6] or '<none>')
-            print(f"  Z_PK={row[0]}, FILE={row[1]}, FAV={row[3]}, DESC='{desc}'")
+    for row in rows:
+        desc = decode_sample(row[-1]) or '<none>'
+        print(f"  Z_PK={row[0]}, FILE={row[1]}, FAV={row[3]}, DESC='{desc}'")
 
 
 def count_totals(cursor: sqlite3.Cursor) -> None:
     """Count totals for verification."""
     print_separator("Database Statistics")
 
-    cursor.execute("SELECT COUNT(*) FROM ZASSET WHERE ZTRASHEDSTATE = 0")
-    total = cursor.fetchone()[0]
+    # One statement, one row: both ZASSET counts share a scan, descriptions come from a scalar subquery
+    cursor.execute("""
+        SELECT
+            COUNT(*),
+            COALESCE(SUM(ZFAVORITE = 1), 0),
+            (SELECT COUNT(*) FROM ZASSETDESCRIPTION WHERE ZLONGDESCRIPTION IS NOT NULL AND ZLONGDESCRIPTION != '')
+        FROM ZASSET
+        WHERE ZTRASHEDSTATE = 0
+    """)
+    total, favorites, descriptions = cursor.fetchone()
     print(f"Total non-trashed assets: {total}")
-
-    cursor.execute("SELECT COUNT(*) FROM ZASSET WHERE ZFAVORITE = 1 AND ZTRASHEDSTATE = 0")
-    favorites = cursor.fetchone()[0]
     print(f"Favorites (non-trashed): {favorites}")
-
-    cursor.execute("SELECT COUNT(*) FROM ZASSETDESCRIPTION WHERE ZLONGDESCRIPTION IS NOT NULL AND ZLONGDESCRIPTION != ''")
-    descriptions = cursor.fetchone()[0]
     print(f"Assets with descriptions: {descriptions}")
 
 
-def check_zasset_join_column(cursor: sqlite3.Cursor) -> None:
+def check_zasset_join_column(cursor: sqlite3.Cursor, schema: dict[str, list[tuple[str, str]]]) -> None:
     """Check what column in ZASSET links to ZADDITIONALASSETATTRIBUTES."""
     print_separator("Checking ZASSET -> ZADDITIONALASSETATTRIBUTES relationship")
 
-    columns = get_table_columns(cursor, 'ZASSET')
+    columns = schema.get('ZASSET', [])
     matching = [c for c in columns if 'ADDITIONAL' in c[0].upper()]
     print("ZASSET columns mentioning 'ADDITIONAL':")
     for col_name, col_type in matching:
         print(f"  - {col_name} ({col_type})")
 
+    foreign_keys = get_foreign_keys(cursor, 'ZASSET', 'ZADDITIONALASSETATTRIBUTES')
+    if foreign_keys:
+        print("\nDeclared foreign keys:")
+        for col_name, ref_col in foreign_keys:
+            print(f"  ZASSET.{col_name} -> ZADDITIONALASSETATTRIBUTES.{ref_col}")
+        return
+
     # Check sample values - iOS 18 uses ZADDITIONALATTRIBUTES (not ZADDITIONALASSETATTRIBUTES)
     cursor.execute("""
         SELECT Z_PK, ZADDITIONALATTRIBUTES
@@ -274,41 +385,50 @@ def check_zasset_join_column(cursor: sqlite3.Cursor) -> None:
         WHERE a.ZADDITIONALATTRIBUTES IS NOT NULL
         LIMIT 5
     """)
-    rows = cursor.fetchall()
     print("\nVerifying join ZASSET.ZADDITIONALATTRIBUTES = ZADDITIONALASSETATTRIBUTES.Z_PK:")
-    for row in rows:
+    for row in cursor:
         match = "MATCH" if row[1] == row[2] else "MISMATCH"
         print(f"  ZASSET.Z_PK={row[0]}, ZASSET.ZADDITIONALATTRIBUTES={row[1]}, AA.Z_PK={row[2]}, AA.ZASSET={row[3]} [{match}]")
 
 
 def main():
     print(f"Database: {DB_PATH}")
-    print(f"Exists: {DB_PATH.exists()}")
 
-    if not DB_PATH.exists():
-        print("ERROR: Database file not found!")
+    try:
+        conn = open_connection(DB_PATH)
+    except sqlite3.OperationalError as e:
+        print(f"ERROR: Cannot open database: {e}")
         return
 
-    with sqlite3.connect(DB_PATH) as conn:
+    with conn:
+        # One read transaction for the whole run: a single snapshot and lock acquisition
+        conn.execute("BEGIN")
         cursor = conn.cursor()
+        tables = get_all_tables(cursor)
 
         # Run all discovery functions
         search_column_in_tables(cursor, 'FAVORITE')
         search_column_in_tables(cursor, 'DESCRIPTION')
         search_column_in_tables(cursor, 'LONGDESCRIPTION')
 
-        explore_zasset(cursor)
-        explore_description_tables(cursor)
-        explore_zassetdescription(cursor)
-        explore_zadditionalassetattributes(cursor)
+        # Columns of every table the explorers look at, fetched in one query
+        tables_of_interest = ['ZASSET'] + [t for t in tables if is_description_table(t)]
+        schema = load_table_columns(cursor, tables_of_interest)
+
+        explore_zasset(schema)
+        explore_description_tables(schema)
+        explore_zassetdescription(cursor, schema)
+        explore_zadditionalassetattributes(schema)
 
-        check_zasset_join_column(cursor)
-        find_join_path(cursor)
+        check_zasset_join_column(cursor, schema)
+        find_join_path(cursor, frozenset(tables))
 
         sample_favorites(cursor)
         count_totals(cursor)
 
-        test_full_query(cursor)
+        test_full_query(cursor, schema)
+
+        conn.execute("COMMIT")
 
 
 if __name__ == "__main__":
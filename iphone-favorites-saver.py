@@ -4,23 +4,34 @@
 from __future__ import annotations
 
 import argparse
+import io
 import logging
+import logging.handlers
 import os
+import re
 import shlex
 import shutil
 import sqlite3
 import subprocess
 import sys
-import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import IO, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+try:
+    # Optional: orjson parses large exiftool -json batches noticeably faster
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 MIN_PYTHON = (3, 8)
 SUPPORTED_EXTENSIONS = {".jpg", ".jpeg", ".heic", ".png"}
-APPLE_SUFFIX = "APPLE"
+# Camera roll folder names such as 100APPLE or 162apple
+APPLE_DIR_RE = re.compile(r"\d+APPLE", re.IGNORECASE)
 
 EXIT_SUCCESS = 0
 EXIT_GENERAL_ERROR = 1
@@ -28,6 +39,28 @@ EXIT_EXIFTOOL_MISSING = 2
 EXIT_INVALID_DB = 3
 EXIT_NO_PHOTOS = 4
 
+# Options applied to every command executed by an ExifToolSession
+EXIFTOOL_COMMON_ARGS = ("-charset", "utf8", "-charset", "filename=utf8", "-q", "-q")
+# Write commands sent to exiftool per round trip; keeps the pipes from filling up
+WRITE_BATCH_SIZE = 100
+# Files per exiftool read command when reads are spread over several processes
+READ_CHUNK_SIZE = 250
+# Log records held in memory before they are written to the log file
+LOG_BUFFER_CAPACITY = 1024
+# Concurrent exiftool processes used for large libraries unless --jobs says otherwise
+DEFAULT_JOBS = min(8, os.cpu_count() or 1)
+# Read-only tuning for the large Photos.sqlite: 64MB page cache, 256MB memory map, in-memory temp tables
+READ_PRAGMAS = (
+    "PRAGMA query_only=1",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+ChunkItem = TypeVar("ChunkItem")
+ChunkResult = TypeVar("ChunkResult")
+
 
 @dataclass(frozen=True)
 class PhotoMeta:
@@ -62,19 +95,148 @@ class ExifData:
     description: Optional[str]
 
 
+@dataclass(frozen=True)
+class PendingWrite:
+    """EXIF update decided for a photo, applied after all conflicts are resolved."""
+
+    path: str
+    rel_path: str
+    rating: Optional[int]
+    description: Optional[str]
+
+
 class ExifToolError(RuntimeError):
     """Raised when exiftool execution fails."""
 
 
+class ExifToolSession:
+    """A single ``exiftool -stay_open`` process that executes many commands.
+
+    Arguments travel over stdin one per line, encoded as UTF-8, so non-ASCII
+    values need no temporary argfile. Each command is terminated by
+    ``-execute``; its output ends at the ``{ready}`` marker on stdout, and an
+    echoed marker on stderr delimits its error output.
+    """
+
+    READY = "{ready}"
+
+    def __init__(self, executable: str = "exiftool") -> None:
+        self.executable = executable
+        self._process: Optional[subprocess.Popen[str]] = None
+
+    def __enter__(self) -> ExifToolSession:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def start(self) -> None:
+        self._process = subprocess.Popen(
+            [self.executable, "-stay_open", "True", "-@", "-", "-common_args", *EXIFTOOL_COMMON_ARGS],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+        )
+
+    def close(self) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.write("-stay_open\nFalse\n")
+            process.stdin.flush()
+            process.communicate(timeout=30)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.communicate()
+
+    def restart(self) -> None:
+        """Replace the process, e.g. after it died, so later commands don't hit a dead pipe."""
+        self.close()
+        self.start()
+
+    def execute(self, args: Sequence[str]) -> subprocess.CompletedProcess[str]:
+        return self.execute_many([args])[0]
+
+    def execute_many(
+        self, commands: Sequence[Sequence[str]]
+    ) -> List[subprocess.CompletedProcess[str]]:
+        """Send several commands in one write and collect their results in order."""
+        process = self._process
+        if process is None:
+            raise ExifToolError("exiftool session is not running")
+
+        lines: List[str] = []
+        for args in commands:
+            lines.extend([*args, "-echo3", "${status}", "-echo4", self.READY, "-execute"])
+        try:
+            process.stdin.write("\n".join(lines) + "\n")
+            process.stdin.flush()
+        except OSError as exc:
+            raise ExifToolError("exiftool session terminated unexpectedly") from exc
+
+        results: List[subprocess.CompletedProcess[str]] = []
+        for args in commands:
+            stdout = self._read_until_ready(process.stdout)
+            stderr = self._read_until_ready(process.stderr)
+            # The last stdout line is the echoed exit status of this command
+            status = stdout.pop().strip() if stdout else ""
+            if status.isdigit():
+                returncode = int(status)
+            else:
+                returncode = 1 if any(line.strip() for line in stderr) else 0
+            results.append(
+                subprocess.CompletedProcess(list(args), returncode, "".join(stdout), "".join(stderr))
+            )
+        return results
+
+    def _read_until_ready(self, stream: Optional[IO[str]]) -> List[str]:
+        lines: List[str] = []
+        while True:
+            line = stream.readline() if stream else ""
+            if not line:
+                raise ExifToolError("exiftool session terminated unexpectedly")
+            if line.rstrip("\r\n") == self.READY:
+                return lines
+            lines.append(line)
+
+
 class ConsoleReporter:
-    """Handles stdout messaging with optional verbosity."""
+    """Handles stdout messaging with optional verbosity.
 
-    def __init__(self, verbose: bool) -> None:
+    Console and log output are buffered and flushed together at every phase
+    boundary, whether or not the phase banner itself is printed. Phase
+    banners and errors are flushed as soon as they are printed.
+    """
+
+    def __init__(self, verbose: bool, logger: Optional[logging.Logger] = None) -> None:
         self.verbose = verbose
+        self.logger = logger
+        if not verbose:
+            # Verbose-only output becomes a no-op instead of a per-call check
+            self.phase = self._quiet_phase
+            self.detail = self._discard
+
+    @staticmethod
+    def _discard(message: str) -> None:
+        pass
+
+    def _quiet_phase(self, message: str) -> None:
+        self.flush()
+
+    def flush(self) -> None:
+        sys.stdout.flush()
+        if self.logger is not None:
+            for handler in self.logger.handlers:
+                handler.flush()
 
     def phase(self, message: str) -> None:
-        if self.verbose:
-            print(f"\n== {message} ==")
+        self.flush()
+        # The banner goes out at once so a long phase is announced when it starts
+        print(f"\n== {message} ==", flush=True)
 
     def info(self, message: str, *, verbose_only: bool = False) -> None:
         if verbose_only and not self.verbose:
@@ -85,11 +247,11 @@ class ConsoleReporter:
         print(f"WARNING: {message}")
 
     def error(self, message: str) -> None:
-        print(f"ERROR: {message}")
+        # Errors are rare, so each one is shown as it happens
+        print(f"ERROR: {message}", flush=True)
 
     def detail(self, message: str) -> None:
-        if self.verbose:
-            print(message)
+        print(message)
 
 
 def strip_arg_quotes(value: str) -> str:
@@ -118,9 +280,12 @@ def main() -> None:
         args.verbose = True
 
     start_time = time.time()
-    reporter = ConsoleReporter(args.verbose)
+    # Output is flushed by the reporter at phase boundaries rather than per line
+    if isinstance(sys.stdout, io.TextIOWrapper):
+        sys.stdout.reconfigure(line_buffering=False)
 
     logger, log_path = setup_logger()
+    reporter = ConsoleReporter(args.verbose, logger)
     reporter.phase("Checking dependencies")
     try:
         exiftool_info = check_dependencies()
@@ -137,11 +302,16 @@ def main() -> None:
     log_run_header(logger, args, exiftool_info, log_path)
 
     reporter.phase("Validating database")
-    if not validate_database(args.database, logger, reporter):
+    opened = validate_database(args.database, logger, reporter)
+    if opened is None:
         sys.exit(EXIT_INVALID_DB)
+    conn, tables = opened
 
     reporter.phase("Reading metadata from Photos.sqlite")
-    metadata = read_database_metadata(args.database, logger)
+    try:
+        metadata = read_database_metadata(conn, tables, args.database, logger)
+    finally:
+        conn.close()
     if not metadata:
         reporter.warn("Database contains no favorites or descriptions. Nothing to migrate.")
         logger.warning("Database query returned zero rows containing favorites/descriptions.")
@@ -201,9 +371,25 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Pass -overwrite_original to exiftool so no *_original backups are kept",
     )
+    parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=DEFAULT_JOBS,
+        help=f"Number of exiftool processes used in parallel for large libraries (default: {DEFAULT_JOBS})",
+    )
     return parser.parse_args()
 
 
+def positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value}")
+    return number
+
+
 def setup_logger() -> Tuple[logging.Logger, Path]:
     logs_dir = Path(__file__).resolve().parent / "logs"
     logs_dir.mkdir(exist_ok=True)
@@ -217,7 +403,8 @@ def setup_logger() -> Tuple[logging.Logger, Path]:
     file_handler = logging.FileHandler(log_path, encoding="utf-8")
     formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    # Records reach the file in batches; errors and phase boundaries flush immediately
+    logger.addHandler(logging.handlers.MemoryHandler(LOG_BUFFER_CAPACITY, target=file_handler))
 
     return logger, log_path
 
@@ -244,6 +431,8 @@ def log_run_footer(logger: logging.Logger, stats: Dict[str, int], start_time: fl
         stats.get("errors", 0),
     )
     logger.info("Runtime: %.2f seconds", duration)
+    for handler in logger.handlers:
+        handler.flush()
 
 
 def check_dependencies() -> Tuple[str, str]:
@@ -258,70 +447,99 @@ def check_dependencies() -> Tuple[str, str]:
     return exiftool_path, version
 
 
+def apply_read_pragmas(conn: sqlite3.Connection, logger: logging.Logger) -> None:
+    for pragma in READ_PRAGMAS:
+        try:
+            conn.execute(pragma)
+        except sqlite3.Error as exc:
+            # Tuning only; the queries still work with SQLite defaults
+            logger.warning("Could not apply %s: %s", pragma, exc)
+
+
+def open_photos_db(db_path: str, logger: logging.Logger) -> sqlite3.Connection:
+    """Open Photos.sqlite read-only with the read PRAGMAs applied.
+
+    Without a -wal sidecar the file is also opened as immutable, which lets
+    SQLite skip locking entirely. A copied WAL still holds committed rows, so
+    in that case the normal read-only mode is used to have SQLite read it.
+    """
+    uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+    if not os.path.exists(f"{db_path}-wal"):
+        uri += "&immutable=1"
+    conn = sqlite3.connect(uri, uri=True, isolation_level=None)
+    apply_read_pragmas(conn, logger)
+    return conn
+
+
 def validate_database(
     db_path: str, logger: logging.Logger, reporter: ConsoleReporter
-) -> bool:
+) -> Optional[Tuple[sqlite3.Connection, Dict[str, List[str]]]]:
+    """Open the database and check it is a Photos library.
+
+    Returns the open connection together with its table columns for reading
+    metadata, or None on failure.
+    """
     if not os.path.exists(db_path):
         msg = f"Database file not found: {db_path}"
         logger.error(msg)
         reporter.error(msg)
-        return False
+        return None
 
+    conn: Optional[sqlite3.Connection] = None
     try:
-        with sqlite3.connect(db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = {row[0] for row in cursor.fetchall()}
+        conn = open_photos_db(db_path, logger)
+        tables = fetch_table_names(conn.cursor())
 
         if "ZASSET" not in tables:
             msg = f"Not a valid Photos.sqlite database (missing ZASSET): {db_path}"
             logger.error(msg)
             reporter.error(msg)
-            return False
+            conn.close()
+            return None
     except sqlite3.Error as exc:
+        if conn is not None:
+            conn.close()
         msg = f"Failed to open database {db_path}: {exc}"
         logger.error(msg)
         reporter.error("Failed to open database. See log for details.")
-        return False
+        return None
 
-    return True
+    return conn, tables
 
 
-def read_database_metadata(db_path: str, logger: logging.Logger) -> Dict[str, PhotoMeta]:
+def read_database_metadata(
+    conn: sqlite3.Connection,
+    tables: Dict[str, List[str]],
+    db_path: str,
+    logger: logging.Logger,
+) -> Dict[str, PhotoMeta]:
     metadata: Dict[str, PhotoMeta] = {}
+    duplicates = 0
 
     try:
-        with sqlite3.connect(db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+
+        query, desc_expr = build_metadata_query(cursor, tables)
+
+        # Rows are consumed straight from the cursor instead of being materialized first
+        for row in cursor.execute(query):
+            filename_db = row["ZFILENAME"] or ""
+            directory = row["ZDIRECTORY"] or ""
+            favorite = bool(row["ZFAVORITE"])
+            description = (row["DESCRIPTION"] or "").strip()
 
-            tables = fetch_table_names(cursor)
-            query, desc_expr = build_metadata_query(cursor, tables)
+            truncated, normalized = build_and_normalize(directory, filename_db)
 
-            cursor.execute(query)
-            rows = cursor.fetchall()
+            # First row wins; setdefault hands back the earlier entry for duplicates
+            meta = PhotoMeta(truncated, favorite, description)
+            if metadata.setdefault(normalized, meta) is not meta:
+                duplicates += 1
 
     except sqlite3.Error as exc:
         logger.error("Error reading database %s: %s", db_path, exc)
         return {}
 
-    duplicates = 0
-    for row in rows:
-        filename_db = row["ZFILENAME"] or ""
-        directory = row["ZDIRECTORY"] or ""
-        favorite = bool(row["ZFAVORITE"])
-        description = (row["DESCRIPTION"] or "").strip()
-
-        full_relative = build_relative_path(directory, filename_db)
-        truncated = truncate_to_apple_path(full_relative)
-        normalized = normalize_rel_path(truncated)
-
-        if normalized in metadata:
-            duplicates += 1
-            continue
-
-        metadata[normalized] = PhotoMeta(truncated, favorite, description)
-
     logger.info(
         "Loaded %s metadata row(s) (duplicates skipped: %s). Description expression: %s",
         len(metadata),
@@ -332,13 +550,14 @@ def read_database_metadata(db_path: str, logger: logging.Logger) -> Dict[str, Ph
 
 
 def fetch_table_names(cursor: sqlite3.Cursor) -> Dict[str, List[str]]:
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    tables = {row[0] for row in cursor.fetchall()}
+    # Every (table, column) pair in one statement instead of one PRAGMA per table
+    cursor.execute(
+        "SELECT m.name, p.name FROM sqlite_master AS m JOIN pragma_table_info(m.name) AS p "
+        "WHERE m.type = 'table' ORDER BY m.name, p.cid"
+    )
     table_columns: Dict[str, List[str]] = {}
-    for table in tables:
-        cursor.execute(f"PRAGMA table_info({table})")
-        columns = [row[1] for row in cursor.fetchall()]
-        table_columns[table] = columns
+    for table, column in cursor:
+        table_columns.setdefault(table, []).append(column)
     return table_columns
 
 
@@ -400,38 +619,53 @@ def build_metadata_query(cursor: sqlite3.Cursor, tables: Dict[str, List[str]]) -
     else:
         desc_expr = "''"
 
+    # The CTE names the description expression once so the outer filter reuses it
     query = f"""
-        SELECT
-            ZASSET.ZFILENAME,
-            ZASSET.ZDIRECTORY,
-            ZASSET.ZFAVORITE,
-            {desc_expr} AS DESCRIPTION
-        FROM ZASSET
-        {' '.join(joins)}
-        WHERE ZASSET.ZTRASHEDSTATE = 0
-          AND (ZASSET.ZFAVORITE = 1 OR {desc_expr} != '')
+        WITH base AS (
+            SELECT
+                ZASSET.ZFILENAME AS ZFILENAME,
+                ZASSET.ZDIRECTORY AS ZDIRECTORY,
+                ZASSET.ZFAVORITE AS ZFAVORITE,
+                {desc_expr} AS DESCRIPTION
+            FROM ZASSET
+            {' '.join(joins)}
+            WHERE ZASSET.ZTRASHEDSTATE = 0
+              AND UPPER(ZASSET.ZDIRECTORY) GLOB '*[0-9]APPLE*'
+        )
+        SELECT ZFILENAME, ZDIRECTORY, ZFAVORITE, DESCRIPTION
+        FROM base
+        WHERE ZFAVORITE = 1 OR DESCRIPTION != ''
     """
 
     return " ".join(query.split()), desc_expr
 
 
-def build_relative_path(directory: str, filename: str) -> str:
-    if not directory:
-        return filename
-    combined = Path(directory) / filename
-    return combined.as_posix()
+def build_and_normalize(directory: str, filename: str) -> Tuple[str, str]:
+    """Join a database directory and filename and cut the path at its NNNAPPLE folder.
 
-
-def truncate_to_apple_path(path_str: str) -> str:
-    parts = path_str.replace("\\", "/").split("/")
+    Returns the truncated path and its lowercase lookup key in a single pass
+    over plain strings.
+    """
+    combined = f"{directory}/{filename}" if directory else filename
+    # Empty and "." segments are dropped, as Path() would do
+    parts = [part for part in combined.replace("\\", "/").split("/") if part not in ("", ".")]
     for idx, part in enumerate(parts):
-        if part.upper().endswith(APPLE_SUFFIX) and part[:-5].isdigit():
-            return "/".join(parts[idx:])
-    return path_str.replace("\\", "/")
+        if APPLE_DIR_RE.fullmatch(part):
+            truncated = "/".join(parts[idx:])
+            return truncated, truncated.lower()
+    truncated = "/".join(parts)
+    return truncated, truncated.lower()
+
+
+if os.sep == "/":
+
+    def normalize_rel_path(rel_path: str) -> str:
+        return rel_path.lower()
 
+else:
 
-def normalize_rel_path(rel_path: str) -> str:
-    return Path(rel_path).as_posix().lower()
+    def normalize_rel_path(rel_path: str) -> str:
+        return rel_path.replace("\\", "/").lower()
 
 
 def scan_photo_files(
@@ -446,25 +680,33 @@ def scan_photo_files(
     photo_files: Dict[str, FileRecord] = {}
     apple_dir_found = False
 
-    for root, _, files in os.walk(base_path):
-        root_path = Path(root)
-        path_parts = [part for part in root_path.relative_to(base_path).parts if part]
-        if any(part.upper().endswith(APPLE_SUFFIX) and part[:-5].isdigit() for part in path_parts):
-            apple_dir_found = True
-        else:
-            continue
+    # Photos are exported as <photo_dir>/NNNAPPLE/<file>, so two directory levels cover the library
+    try:
+        with os.scandir(base_path) as top_entries:
+            apple_dirs = [
+                entry
+                for entry in top_entries
+                if entry.is_dir() and APPLE_DIR_RE.fullmatch(entry.name)
+            ]
+    except OSError as exc:
+        logger.error("Could not read photo directory %s: %s", photo_dir, exc)
+        reporter.error(f"Could not read photo directory: {photo_dir}")
+        return {}
 
-        for file_name in files:
-            ext = Path(file_name).suffix.lower()
-            if ext not in SUPPORTED_EXTENSIONS:
-                continue
-            rel_path = (root_path / file_name).relative_to(base_path).as_posix()
-            normalized = normalize_rel_path(rel_path)
-            if normalized in photo_files:
-                logger.warning("Duplicate file encountered after normalization: %s", rel_path)
-                reporter.detail(f"Duplicate file skipped: {rel_path}")
-                continue
-            photo_files[normalized] = FileRecord(rel_path, str(root_path / file_name))
+    for apple_dir in apple_dirs:
+        apple_dir_found = True
+        try:
+            with os.scandir(apple_dir.path) as entries:
+                for entry in entries:
+                    if not entry.is_file() or os.path.splitext(entry.name)[1].lower() not in SUPPORTED_EXTENSIONS:
+                        continue
+                    rel_path = f"{apple_dir.name}/{entry.name}"
+                    record = FileRecord(rel_path, entry.path)
+                    if photo_files.setdefault(normalize_rel_path(rel_path), record) is not record:
+                        logger.warning("Duplicate file encountered after normalization: %s", rel_path)
+                        reporter.detail(f"Duplicate file skipped: {rel_path}")
+        except OSError as exc:
+            logger.warning("Could not read directory %s: %s", apple_dir.path, exc)
 
     if not apple_dir_found:
         message = f"No folders matching */[0-9]+APPLE were found under {photo_dir}"
@@ -482,15 +724,18 @@ def match_metadata(
     logger: logging.Logger,
     reporter: ConsoleReporter,
 ) -> List[MatchedPhoto]:
-    matched: List[MatchedPhoto] = []
-    missing_files = 0
-    for key, meta in metadata.items():
-        file_record = photo_files.get(key)
-        if not file_record:
-            missing_files += 1
-            continue
-        matched.append(MatchedPhoto(file_record, meta))
+    # Walk whichever side is smaller and look keys up in the other
+    if len(metadata) <= len(photo_files):
+        matched = [
+            MatchedPhoto(photo_files[key], meta) for key, meta in metadata.items() if key in photo_files
+        ]
+    else:
+        matched = [
+            MatchedPhoto(record, metadata[key]) for key, record in photo_files.items() if key in metadata
+        ]
 
+    # Keys are unique on both sides, so every unmatched record is one missing file
+    missing_files = len(metadata) - len(matched)
     if missing_files:
         message = f"{missing_files} metadata record(s) did not have matching files on disk."
         logger.warning(message)
@@ -509,89 +754,95 @@ def run_migration(
 ) -> Dict[str, int]:
     stats = {"processed": 0, "skipped": 0, "errors": 0}
     skip_all_conflicts = False
+    pending_writes: List[PendingWrite] = []
+
+    # One exiftool process serves every read and write of the run
+    with ExifToolSession() as session:
+        # Existing EXIF values for every photo that may need an update, read in bulk
+        existing_map = read_exif_parallel(
+            [entry.record.full_path for entry in matched if entry.meta.favorite or entry.meta.description],
+            logger,
+            session,
+            args.jobs,
+        )
 
-    for entry in matched:
-        rel_path = entry.record.rel_path
-        meta = entry.meta
-        full_path = entry.record.full_path
-
-        reporter.detail(f"Processing {rel_path}")
-
-        if not meta.favorite and not meta.description:
-            stats["skipped"] += 1
-            reporter.detail(f"Skipping {rel_path} - no metadata present in database.")
-            continue
-
-        try:
-            existing = read_exif_data(full_path, logger)
-        except ExifToolError:
-            reporter.error(f"Failed to read EXIF for {rel_path}. See log for details.")
-            stats["errors"] += 1
-            continue
-
-        needs_rating = meta.favorite and (existing.rating is None or existing.rating < 4)
-        needs_description = bool(meta.description) and meta.description != (existing.description or "")
+        for entry in matched:
+            rel_path = entry.record.rel_path
+            meta = entry.meta
+            full_path = entry.record.full_path
 
-        if not needs_rating and not needs_description:
-            logger.info("Skipping %s - no EXIF changes required.", rel_path)
-            reporter.detail(f"Skipping {rel_path} - already up to date.")
-            stats["skipped"] += 1
-            continue
+            if reporter.verbose:
+                reporter.detail(f"Processing {rel_path}")
 
-        has_conflict = evaluate_conflict(existing, needs_rating, needs_description)
-        if has_conflict:
-            if skip_all_conflicts:
+            if not meta.favorite and not meta.description:
                 stats["skipped"] += 1
-                reporter.detail(f"Skipping {rel_path} due to 'skip all' selection.")
+                reporter.detail(f"Skipping {rel_path} - no metadata present in database.")
                 continue
 
-            decision = prompt_conflict(rel_path, existing, meta)
-            if decision == "skip":
-                stats["skipped"] += 1
-                reporter.detail(f"User chose to keep existing metadata for {rel_path}.")
+            existing = existing_map.get(full_path)
+            if existing is None:
+                reporter.error(f"Failed to read EXIF for {rel_path}. See log for details.")
+                stats["errors"] += 1
                 continue
-            if decision == "skip_all":
-                skip_all_conflicts = True
+
+            needs_rating = meta.favorite and (existing.rating is None or existing.rating < 4)
+            needs_description = bool(meta.description) and meta.description != (existing.description or "")
+
+            if not needs_rating and not needs_description:
+                logger.info("Skipping %s - no EXIF changes required.", rel_path)
+                reporter.detail(f"Skipping {rel_path} - already up to date.")
                 stats["skipped"] += 1
-                reporter.detail("User chose to skip all remaining conflicts.")
                 continue
-            # decision == "overwrite" -> continue
-
-        action_rating = 4 if needs_rating else None
-        action_description = meta.description if needs_description else None
 
-        if args.dry_run:
-            reporter.detail(
-                f"[DRY RUN] Would update {rel_path}: rating={action_rating}, "
-                f"description={'<unchanged>' if action_description is None else repr(action_description)}"
-            )
-            cmd_args = build_write_cmd_args(
-                full_path, action_rating, action_description, args.overwrite_original
-            )
-            if cmd_args:
-                logger.info(
-                    "DRY RUN - would run: %s",
-                    format_command(["exiftool", "-charset", "utf8", "-q", "-q", *cmd_args]),
+            has_conflict = evaluate_conflict(existing, needs_rating, needs_description)
+            if has_conflict:
+                if skip_all_conflicts:
+                    stats["skipped"] += 1
+                    reporter.detail(f"Skipping {rel_path} due to 'skip all' selection.")
+                    continue
+
+                decision = prompt_conflict(rel_path, existing, meta)
+                if decision == "skip":
+                    stats["skipped"] += 1
+                    reporter.detail(f"User chose to keep existing metadata for {rel_path}.")
+                    continue
+                if decision == "skip_all":
+                    skip_all_conflicts = True
+                    stats["skipped"] += 1
+                    reporter.detail("User chose to skip all remaining conflicts.")
+                    continue
+                # decision == "overwrite" -> continue
+
+            action_rating = 4 if needs_rating else None
+            action_description = meta.description if needs_description else None
+
+            if args.dry_run:
+                reporter.detail(
+                    f"[DRY RUN] Would update {rel_path}: rating={action_rating}, "
+                    f"description={'<unchanged>' if action_description is None else repr(action_description)}"
                 )
-            stats["processed"] += 1
-            continue
+                cmd_args = build_write_cmd_args(
+                    full_path, action_rating, action_description, args.overwrite_original
+                )
+                if cmd_args:
+                    logger.info(
+                        "DRY RUN - would run: %s",
+                        format_command(["exiftool", "-charset", "utf8", "-q", "-q", *cmd_args]),
+                    )
+                stats["processed"] += 1
+                continue
 
-        try:
-            success = write_exif_data(
-                full_path,
-                action_rating,
-                action_description,
-                args.overwrite_original,
-                logger,
-            )
-        except ExifToolError:
-            success = False
+            pending_writes.append(PendingWrite(full_path, rel_path, action_rating, action_description))
+
+        # Conflicts are settled above, so all updates go to exiftool together
+        outcome = write_exif_parallel(pending_writes, args.overwrite_original, logger, session, args.jobs)
 
-        if success:
-            reporter.detail(f"Updated {rel_path}")
+    for write in pending_writes:
+        if outcome[write.path]:
+            reporter.detail(f"Updated {write.rel_path}")
             stats["processed"] += 1
         else:
-            reporter.error(f"Failed to update {rel_path}. See log for details.")
+            reporter.error(f"Failed to update {write.rel_path}. See log for details.")
             stats["errors"] += 1
 
     return stats
@@ -630,47 +881,201 @@ def prompt_conflict(rel_path: str, existing: ExifData, meta: PhotoMeta) -> str:
     return "skip"
 
 
-def read_exif_data(file_path: str, logger: logging.Logger) -> ExifData:
-    args = ["-Rating", "-ImageDescription", "-Description", file_path]
-    result = run_exiftool(args, logger, purpose="read")
-    rating: Optional[int] = None
-    description: Optional[str] = None
+def bulk_read_exif(
+    paths: Sequence[str], logger: logging.Logger, session: ExifToolSession
+) -> Dict[str, ExifData]:
+    """Read Rating and descriptions of many files with a single exiftool command.
+
+    Returns a mapping keyed by the given paths. Files exiftool could not read
+    are absent from the result; their errors are logged. If the exiftool
+    process itself fails, the whole chunk is absent and the session is
+    restarted for the next one.
+    """
+    if not paths:
+        return {}
 
-    for raw_line in result.stdout.splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
-        key, _, value = line.partition(":")
-        key = key.strip().lower()
-        value = value.strip()
-        if key == "rating":
+    args = ["-json", "-n", "-Rating", "-ImageDescription", "-Description", *paths]
+    try:
+        result = run_exiftool(args, logger, session, purpose="read")
+    except ExifToolError as exc:
+        logger.error("exiftool bulk read of %d files aborted: %s", len(paths), exc)
+        try:
+            session.restart()
+        except OSError as restart_exc:
+            logger.error("Could not restart exiftool: %s", restart_exc)
+        return {}
+    if result.returncode != 0:
+        logger.warning(
+            "exiftool reported errors during bulk read:%s",
+            f"\n{result.stderr.strip()}" if result.stderr.strip() else " <empty>",
+        )
+
+    try:
+        items = json_loads(result.stdout) if result.stdout.strip() else []
+    except ValueError as exc:
+        logger.error("Could not parse exiftool JSON output: %s", exc)
+        return {}
+
+    # exiftool may report SourceFile with different separators, so match on normalized paths
+    requested = {normalize_fs_path(path): path for path in paths}
+    existing: Dict[str, ExifData] = {}
+    for item in items:
+        path = requested.get(normalize_fs_path(str(item.get("SourceFile", ""))))
+        if path is not None:
+            existing[path] = exif_from_json(item)
+    return existing
+
+
+def map_in_sessions(
+    func: Callable[[Sequence[ChunkItem], ExifToolSession], ChunkResult],
+    chunks: Sequence[Sequence[ChunkItem]],
+    max_workers: int,
+    logger: logging.Logger,
+) -> List[ChunkResult]:
+    """Run ``func`` over the chunks on worker threads, each with its own exiftool session.
+
+    Sessions are started lazily, one per worker thread, and closed once all
+    chunks are done. Results are returned in chunk order. A session that
+    fails to start is logged and still handed to ``func``, which fails the
+    chunk as it does for a dead session.
+    """
+    local = threading.local()
+    sessions: List[ExifToolSession] = []
+
+    def run_chunk(chunk: Sequence[ChunkItem]) -> ChunkResult:
+        worker_session = getattr(local, "session", None)
+        if worker_session is None:
+            worker_session = ExifToolSession()
+            sessions.append(worker_session)
+            local.session = worker_session
             try:
-                rating = int(value)
-            except ValueError:
-                continue
-        elif key in {"imagedescription", "description"}:
-            if value:
-                description = value
+                worker_session.start()
+            except OSError as exc:
+                logger.error("Could not start an exiftool worker session: %s", exc)
+        return func(chunk, worker_session)
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(len(chunks), max_workers)) as executor:
+            return list(executor.map(run_chunk, chunks))
+    finally:
+        for worker_session in sessions:
+            worker_session.close()
+
+
+def read_exif_parallel(
+    paths: Sequence[str],
+    logger: logging.Logger,
+    session: ExifToolSession,
+    max_workers: int = DEFAULT_JOBS,
+) -> Dict[str, ExifData]:
+    """Read EXIF of many files, spreading READ_CHUNK_SIZE chunks over worker sessions.
+
+    A single chunk, or a single worker, is read through ``session``.
+    """
+    chunks = [paths[start : start + READ_CHUNK_SIZE] for start in range(0, len(paths), READ_CHUNK_SIZE)]
+    if len(chunks) <= 1 or max_workers <= 1:
+        return bulk_read_exif(paths, logger, session)
+
+    existing: Dict[str, ExifData] = {}
+    for result in map_in_sessions(
+        lambda chunk, worker_session: bulk_read_exif(chunk, logger, worker_session),
+        chunks,
+        max_workers,
+        logger,
+    ):
+        existing.update(result)
+    return existing
+
+
+def exif_from_json(item: Dict[str, object]) -> ExifData:
+    # -n makes exiftool emit Rating as a JSON number; anything else is not a usable rating
+    rating_value = item.get("Rating")
+    rating = int(rating_value) if isinstance(rating_value, (int, float)) else None
 
+    # Numeric-looking descriptions arrive as JSON numbers, so 0 is a real value, not a missing one
+    description: Optional[str] = None
+    for key in ("ImageDescription", "Description"):
+        value = item.get(key)
+        if value is not None and value != "":
+            description = str(value)
+            break
     return ExifData(rating, description)
 
 
-def write_exif_data(
-    file_path: str,
-    rating: Optional[int],
-    description: Optional[str],
+def normalize_fs_path(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+def write_exif_batch(
+    pending: Sequence[PendingWrite],
     overwrite_original: bool,
     logger: logging.Logger,
-) -> bool:
-    if rating is None and description is None:
-        return True
+    session: ExifToolSession,
+) -> Dict[str, bool]:
+    """Write all pending updates through the session, WRITE_BATCH_SIZE commands per round trip.
 
-    cmd_args = build_write_cmd_args(file_path, rating, description, overwrite_original)
-    if not cmd_args:
-        return True
+    Every file stays a separate exiftool command so its exit status tells
+    whether that file was written. Returns success per file path.
+    """
+    outcome: Dict[str, bool] = {}
+    commands: List[Tuple[str, List[str]]] = []
+    for write in pending:
+        outcome[write.path] = True
+        cmd_args = build_write_cmd_args(write.path, write.rating, write.description, overwrite_original)
+        if cmd_args:
+            commands.append((write.path, cmd_args))
+
+    for start in range(0, len(commands), WRITE_BATCH_SIZE):
+        chunk = commands[start : start + WRITE_BATCH_SIZE]
+        for path, cmd_args in chunk:
+            logger.info(
+                "[WRITE] exiftool command: %s",
+                format_command(["exiftool", *EXIFTOOL_COMMON_ARGS, *cmd_args]),
+            )
+        try:
+            results = session.execute_many([cmd_args for _, cmd_args in chunk])
+        except ExifToolError as exc:
+            logger.error("exiftool batch write aborted: %s", exc)
+            for path, _ in commands[start:]:
+                outcome[path] = False
+            try:
+                session.restart()
+            except OSError as restart_exc:
+                logger.error("Could not restart exiftool: %s", restart_exc)
+            break
 
-    run_exiftool(cmd_args, logger, purpose="write")
-    return True
+        for (path, cmd_args), result in zip(chunk, results):
+            if result.returncode != 0:
+                display_cmd = format_command(["exiftool", *EXIFTOOL_COMMON_ARGS, *cmd_args])
+                log_exiftool_failure(logger, display_cmd, result.returncode, result.stdout, result.stderr)
+                outcome[path] = False
+    return outcome
+
+
+def write_exif_parallel(
+    pending: Sequence[PendingWrite],
+    overwrite_original: bool,
+    logger: logging.Logger,
+    session: ExifToolSession,
+    max_workers: int = DEFAULT_JOBS,
+) -> Dict[str, bool]:
+    """Write pending updates, spreading WRITE_BATCH_SIZE chunks over worker sessions.
+
+    A single chunk, or a single worker, is written through ``session``.
+    """
+    chunks = [pending[start : start + WRITE_BATCH_SIZE] for start in range(0, len(pending), WRITE_BATCH_SIZE)]
+    if len(chunks) <= 1 or max_workers <= 1:
+        return write_exif_batch(pending, overwrite_original, logger, session)
+
+    outcome: Dict[str, bool] = {}
+    for result in map_in_sessions(
+        lambda chunk, worker_session: write_exif_batch(chunk, overwrite_original, logger, worker_session),
+        chunks,
+        max_workers,
+        logger,
+    ):
+        outcome.update(result)
+    return outcome
 
 
 def build_write_cmd_args(
@@ -702,82 +1107,36 @@ def build_write_cmd_args(
 
 
 def run_exiftool(
-    cmd_args: Sequence[str], logger: logging.Logger, purpose: str = "RUN"
+    cmd_args: Sequence[str],
+    logger: logging.Logger,
+    session: ExifToolSession,
+    purpose: str = "RUN",
 ) -> subprocess.CompletedProcess[str]:
-    """Run exiftool with the given arguments.
+    """Run exiftool with the given arguments on the session's ``-stay_open`` process.
 
-    For write operations, uses an argfile with UTF-8 BOM encoding to ensure
-    proper handling of non-ASCII characters (e.g., Hungarian áéíóöőúüű) on Windows.
+    The caller inspects the exit status of the returned result itself.
     """
-    # For write operations, use argfile to preserve UTF-8 encoding
-    # This is necessary because Windows command line uses cp1252 by default
-    if purpose.lower() == "write":
-        return _run_exiftool_with_argfile(cmd_args, logger)
-
-    # For read operations, command line is fine
-    full_cmd = ["exiftool", "-charset", "utf8", "-q", "-q", *cmd_args]
-    display_cmd = format_command(full_cmd)
+    display_cmd = format_command(["exiftool", *EXIFTOOL_COMMON_ARGS, *cmd_args])
     logger.info("[%s] exiftool command: %s", purpose.upper(), display_cmd)
-
-    try:
-        result = subprocess.run(full_cmd, capture_output=True, text=True, check=True)
-        return result
-    except subprocess.CalledProcessError as exc:
-        stdout = exc.stdout.strip()
-        stderr = exc.stderr.strip()
-        logger.error(
-            "exiftool command failed\nCommand: %s\nReturn code: %s\nSTDOUT:%s\nSTDERR:%s",
-            display_cmd,
-            exc.returncode,
-            f"\n{stdout}" if stdout else " <empty>",
-            f"\n{stderr}" if stderr else " <empty>",
-        )
-        raise ExifToolError(display_cmd) from exc
+    return session.execute(cmd_args)
 
 
-def _run_exiftool_with_argfile(
-    cmd_args: Sequence[str], logger: logging.Logger
-) -> subprocess.CompletedProcess[str]:
-    """Run exiftool using an argfile for proper UTF-8 handling on Windows.
-
-    The argfile is written with UTF-8 BOM encoding, which exiftool recognizes
-    and uses to correctly interpret non-ASCII characters.
-    """
-    display_cmd = format_command(["exiftool", "-q", "-q", *cmd_args])
-    logger.info("[WRITE] exiftool command: %s", display_cmd)
-
-    # Create a temporary argfile with UTF-8 BOM encoding
-    fd, argfile_path = tempfile.mkstemp(suffix=".txt", prefix="exiftool_args_")
-    try:
-        # Write arguments to the argfile with UTF-8 BOM
-        with os.fdopen(fd, "w", encoding="utf-8-sig") as f:
-            f.write("-q\n")
-            f.write("-q\n")
-            for arg in cmd_args:
-                f.write(f"{arg}\n")
-
-        logger.info("[WRITE] Using argfile: %s", argfile_path)
-
-        full_cmd = ["exiftool", "-@", argfile_path]
-        result = subprocess.run(full_cmd, capture_output=True, text=True, check=True)
-        return result
-    except subprocess.CalledProcessError as exc:
-        stdout = exc.stdout.strip() if exc.stdout else ""
-        stderr = exc.stderr.strip() if exc.stderr else ""
-        logger.error(
-            "exiftool command failed\nCommand: %s\nReturn code: %s\nSTDOUT:%s\nSTDERR:%s",
-            display_cmd,
-            exc.returncode,
-            f"\n{stdout}" if stdout else " <empty>",
-            f"\n{stderr}" if stderr else " <empty>",
-        )
-        raise ExifToolError(display_cmd) from exc
-    finally:
-        # Clean up the temporary argfile
-        try:
-            os.unlink(argfile_path)
-        except OSError:
-            pass
+def log_exiftool_failure(
+    logger: logging.Logger,
+    display_cmd: str,
+    returncode: int,
+    stdout: Optional[str],
+    stderr: Optional[str],
+) -> None:
+    stdout = stdout.strip() if stdout else ""
+    stderr = stderr.strip() if stderr else ""
+    logger.error(
+        "exiftool command failed\nCommand: %s\nReturn code: %s\nSTDOUT:%s\nSTDERR:%s",
+        display_cmd,
+        returncode,
+        f"\n{stdout}" if stdout else " <empty>",
+        f"\n{stderr}" if stderr else " <empty>",
+    )
 
 
 def format_command(parts: Sequence[str]) -> str:
@@ -1,137 +1,629 @@
 #!/usr/bin/env python3
-"""Test different approaches to write UTF-8 descriptions with exiftool."""
+"""Test different approaches to write UTF-8 descriptions with exiftool.
 
+Run directly for a side-by-side report of every case, or with pytest
+(``pytest -n auto test_write_encoding.py`` when pytest-xdist is installed),
+where each case becomes a separate, parametrized test.
+"""
+
+import bisect
 import subprocess
 import shutil
 from pathlib import Path
 import tempfile
 import os
+import hashlib
+import html
+import mmap
+import re
+import struct
+import threading
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional, Sequence
+
+try:
+    import piexif  # optional: reads ImageDescription without an exiftool round trip
+except ImportError:
+    piexif = None
+
+try:
+    import pyexiv2  # optional: in-process Exiv2 writer, compared as an extra case
+except ImportError:
+    pyexiv2 = None
+
+try:
+    import pytest
+except ImportError:  # the script also runs standalone without pytest
+    pytest = None
+
+# Read the tags back with exiftool even when the in-process readers are available.
+# Enabled by --verify-with-exiftool when run directly, or VERIFY_WITH_EXIFTOOL=1 under pytest.
+VERIFY_WITH_EXIFTOOL = (
+    "--verify-with-exiftool" in sys.argv[1:] or os.environ.get("VERIFY_WITH_EXIFTOOL") == "1"
+)
+
+# Spawn options: no console window on Windows, a separate session on POSIX.
+# Only the short-lived command-line write skips closing inherited handles on
+# Windows; the daemons keep close_fds so they never hold each other's pipes open.
+if os.name == "nt":
+    SPAWN_KWARGS = {"creationflags": subprocess.CREATE_NO_WINDOW}
+    ONE_SHOT_KWARGS = {**SPAWN_KWARGS, "close_fds": False}
+else:
+    SPAWN_KWARGS = {"start_new_session": True}
+    ONE_SHOT_KWARGS = SPAWN_KWARGS
 
 # Test string with Hungarian characters
 TEST_STRING = "Teszt: áéíóöőúüű ÁÉÍÓÖŐÚÜŰ és … ellipszis"
+EXPECTED_UTF8 = TEST_STRING.encode("utf-8")
+EXPECTED_HEX = EXPECTED_UTF8.hex()
 
-# Find a test image and make a copy
 TEST_DIR = Path(__file__).parent / "teszt" / "162APPLE"
-source_image = list(TEST_DIR.glob("*.JPG"))[0]  # Use JPG for easier testing
 
-print(f"Source image: {source_image}")
-print(f"Test string: {TEST_STRING}")
-print(f"Test string UTF-8 hex: {TEST_STRING.encode('utf-8').hex()}")
-print()
 
-# Create temp copies for each test
-temp_dir = Path(tempfile.mkdtemp())
-print(f"Temp dir: {temp_dir}")
+def find_source_image() -> Optional[Path]:
+    """First JPG in the test folder (JPG for easier testing), or None.
 
+    Stops at the first match instead of listing the whole folder.
+    """
+    try:
+        with os.scandir(TEST_DIR) as entries:
+            for entry in entries:
+                if entry.name.upper().endswith(".JPG") and entry.is_file():
+                    return Path(entry.path)
+    except FileNotFoundError:
+        pass
+    return None
 
-def make_test_copy(name: str) -> Path:
-    dest = temp_dir / f"{name}.jpg"
-    shutil.copy(source_image, dest)
-    return dest
 
+def scratch_root() -> Optional[str]:
+    """Directory for the test files, preferring memory-backed storage.
 
-def run_exiftool_and_check(args: list, test_file: Path, description: str) -> None:
-    """Run exiftool write, then read back and check."""
-    print(f"\n{'='*70}")
-    print(f"TEST: {description}")
-    print(f"Command: exiftool {' '.join(str(a) for a in args)}")
-    print('='*70)
+    ``RAMDISK`` may name a RAM drive (on Windows e.g. one mapped with
+    ``subst R: <ramdisk path>``); /dev/shm is tmpfs on Linux. ``None`` means
+    the platform default temp directory.
+    """
+    for candidate in (os.environ.get("RAMDISK"), "/dev/shm"):
+        if candidate and os.path.isdir(candidate) and os.access(candidate, os.W_OK):
+            return candidate
+    return None
+
+
+def link_or_copy(src: Path, dest: Path) -> None:
+    try:
+        os.link(src, dest)
+    except OSError:  # different filesystem, or links not supported
+        shutil.copy(src, dest)
+
+
+def run_one_shot(args: list) -> subprocess.CompletedProcess:
+    """Run exiftool once, capturing only stderr.
+
+    On POSIX this spawns with os.posix_spawn directly, skipping subprocess's
+    fork_exec setup; elsewhere (or if exiftool is not on PATH) subprocess.run
+    does the same job.
+    """
+    executable = shutil.which("exiftool") if hasattr(os, "posix_spawn") else None
+    if executable is None:
+        return subprocess.run(
+            ["exiftool"] + args,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            **ONE_SHOT_KWARGS,
+        )
+    # The pipe ends are close-on-exec; dup2 gives the child an inheritable stderr
+    read_fd, write_fd = os.pipe()
+    try:
+        pid = os.posix_spawn(
+            executable,
+            ["exiftool"] + args,
+            os.environ,
+            file_actions=[
+                (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+                (os.POSIX_SPAWN_DUP2, write_fd, 2),
+            ],
+            setsid=True,
+        )
+    finally:
+        os.close(write_fd)
+    with open(read_fd, "rb") as stderr:
+        err = stderr.read()
+    _, status = os.waitpid(pid, 0)
+    returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+    return subprocess.CompletedProcess(["exiftool"] + args, returncode, None, err)
+
+
+class ExifToolDaemon:
+    """One exiftool -stay_open process that runs every write and read-back.
+
+    Commands are sent over stdin and numbered (-executeN), so the output of
+    each command is read up to its own {readyN} marker. The exit status is
+    echoed to stderr just before the marker.
+    """
+
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            ["exiftool", "-stay_open", "True", "-@", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0,
+            **SPAWN_KWARGS,
+        )
+        self.counter = 0
+        self.pending = {}
+
+    def execute(self, args: list) -> subprocess.CompletedProcess:
+        return self.execute_many([args])[0]
+
+    def execute_many(self, commands: list) -> list:
+        """Send several commands in one write, then collect their results in order."""
+        markers = []
+        lines = []
+        for args in commands:
+            self.counter += 1
+            marker = f"{{ready{self.counter}}}"
+            markers.append(marker.encode())
+            lines += [str(a) for a in args] + ["-echo4", "${status}", "-echo4", marker, f"-execute{self.counter}"]
+        self.proc.stdin.write(("\n".join(lines) + "\n").encode("utf-8"))
+
+        results = []
+        for args, marker in zip(commands, markers):
+            stdout = self._read_until(self.proc.stdout, marker)
+            stderr = self._read_until(self.proc.stderr, marker)
+            stderr, _, status = stderr.rstrip(b"\r\n").rpartition(b"\n")
+            returncode = int(status) if status.strip().isdigit() else 1
+            results.append(subprocess.CompletedProcess(args, returncode, stdout, stderr))
+        return results
+
+    def _read_until(self, stream, marker: bytes) -> bytes:
+        """Return everything before ``marker``; bytes after its line wait for the next command.
+
+        -b output has no trailing newline, so the marker can follow the value directly.
+        """
+        data = self.pending.get(stream, b"")
+        while True:
+            start = data.find(marker)
+            end = data.find(b"\n", start) if start >= 0 else -1
+            if end >= 0:
+                break
+            chunk = stream.read(65536)
+            if not chunk:
+                raise RuntimeError("exiftool -stay_open process exited unexpectedly")
+            data += chunk
+        self.pending[stream] = data[end + 1 :]
+        return data[:start]
+
+    def close(self) -> None:
+        self.proc.stdin.write(b"-stay_open\nFalse\n")
+        self.proc.communicate()
+
+
+# Each worker thread gets its own daemon, so concurrent tests never share a pipe
+daemons = []
+thread_state = threading.local()
+
+
+def get_daemon() -> ExifToolDaemon:
+    if not hasattr(thread_state, "daemon"):
+        thread_state.daemon = ExifToolDaemon()
+        daemons.append(thread_state.daemon)
+    return thread_state.daemon
+
+
+def read_image_description(path: Path) -> bytes:
+    """Raw ImageDescription bytes from the EXIF IFD0, parsed in-process by piexif."""
+    return piexif.load(str(path))["0th"].get(piexif.ImageIFD.ImageDescription, b"")
+
+
+XMP_DESCRIPTION_RE = re.compile(
+    rb"<dc:description>\s*<rdf:Alt>\s*<rdf:li[^>]*>(.*?)</rdf:li>", re.DOTALL
+)
+
+
+def read_xmp_description(path: Path) -> bytes:
+    """Raw XMP dc:description bytes, found by scanning the mmapped file for the XMP packet."""
+    with open(path, "rb") as f:
+        # mmap refuses zero-length files, e.g. one truncated by a failed write
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = mm.find(b"<?xpacket begin")
+            end = mm.find(b"<?xpacket end", start) if start >= 0 else -1
+            if end < 0:
+                return b""
+            match = XMP_DESCRIPTION_RE.search(mm, start, end)
+            if not match:
+                return b""
+            raw = match.group(1)
+    if b"&" not in raw:
+        # Nothing escaped, so the bytes compare as they are without a decode/encode round trip
+        return raw
+    # The value is XML-escaped in the packet; surrogateescape keeps invalid UTF-8 bytes as they were
+    value = raw.decode("utf-8", "surrogateescape")
+    return html.unescape(value).encode("utf-8", "surrogateescape")
+
+
+# Argfiles already written, keyed by directory and content digest
+argfile_cache = {}
+argfile_cache_lock = threading.Lock()
+
+
+def write_argfile(work_dir: Path, lines: Sequence[str], bom: bool = True) -> Path:
+    """Write an exiftool argfile as UTF-8, with a BOM unless ``bom`` is False, in one write.
+
+    Files are named after a digest of their content, so cases with identical
+    argfiles share one file instead of writing it again.
+    """
+    text = "".join(f"{line}\n" for line in lines)
+    content = (b"\xef\xbb\xbf" if bom else b"") + text.encode("utf-8")
+    digest = hashlib.blake2b(content, digest_size=16).digest()
+    with argfile_cache_lock:
+        path = argfile_cache.get((work_dir, digest))
+        if path is None:
+            path = work_dir / f"args_{digest.hex()}.txt"
+            path.write_bytes(content)
+            argfile_cache[(work_dir, digest)] = path
+    return path
+
+
+class Case(NamedTuple):
+    """One way of passing the test string to exiftool."""
+
+    name: str
+    description: str
+    args: Sequence[str] = ()
+    argfile: Optional[list] = None  # lines of an argfile passed with -@
+    bom: bool = True
+    command_line: bool = False  # write through a real command line instead of the daemon
+    checks_exif: bool = True  # False when only XMP is written
+    writer: str = "exiftool"  # "pyexiv2" or "native" write in-process instead
+
+
+CASES = [
+    # Test 1: Current approach (what we have now) - likely fails on Windows
+    Case(
+        "test1_current",
+        "Current approach: -charset utf8 (command line)",
+        args=["-charset", "utf8", f"-ImageDescription={TEST_STRING}", f"-Description={TEST_STRING}"],
+        command_line=True,
+    ),
+    # Test 2: Using argfile with UTF-8 BOM
+    Case(
+        "test2_argfile_bom",
+        "Using argfile (-@) with UTF-8 BOM",
+        argfile=[f"-ImageDescription={TEST_STRING}", f"-Description={TEST_STRING}"],
+    ),
+    # Test 3: Using argfile without BOM but with -charset
+    Case(
+        "test3_argfile_charset",
+        "Using argfile with -charset in file",
+        argfile=["-charset", "filename=utf8", f"-ImageDescription={TEST_STRING}", f"-Description={TEST_STRING}"],
+        bom=False,
+    ),
+    # Test 4: Write to XMP only
+    Case(
+        "test4_xmp_only",
+        "XMP only via argfile",
+        argfile=[f"-XMP:Description={TEST_STRING}"],
+        checks_exif=False,
+    ),
+    # Test 5: Combined approach - write to both EXIF and XMP via argfile
+    Case(
+        "test5_combined",
+        "Combined EXIF + XMP via argfile with BOM",
+        argfile=[f"-ImageDescription={TEST_STRING}", f"-XMP:Description={TEST_STRING}"],
+    ),
+    # Test 6: No exiftool process at all - Exiv2 in-process, needs pyexiv2
+    Case(
+        "test6_pyexiv2",
+        "In-process EXIF + XMP write with pyexiv2",
+        writer="pyexiv2",
+    ),
+    # Test 7: No library either - patch ImageDescription straight into the APP1 segment
+    Case(
+        "test7_native_app1",
+        "In-process ImageDescription patch of the JPEG APP1 segment",
+        writer="native",
+    ),
+]
 
-    # Write
-    result = subprocess.run(
-        ["exiftool", "-overwrite_original"] + args + [str(test_file)],
-        capture_output=True,
-    )
-    if result.returncode != 0:
-        print(f"WRITE FAILED: {result.stderr}")
-        return
+IN_PROCESS_COMMANDS = {
+    "pyexiv2": "pyexiv2 Image.modify_exif + Image.modify_xmp",
+    "native": "patch_jpeg_image_description (EXIF only)",
+}
+
+JPEG_SEGMENT = struct.Struct(">HH")  # marker, length (length includes itself, not the marker)
+EXIF_HEADER = b"Exif\0\0"
+TIFF_START = JPEG_SEGMENT.size + len(EXIF_HEADER)  # TIFF offsets count from here within APP1
+IMAGE_DESCRIPTION_TAG = 0x010E
+TIFF_ASCII = 2
+
+
+def write_with_pyexiv2(path: Path) -> None:
+    """Write the test string to EXIF and XMP with Exiv2."""
+    image = pyexiv2.Image(str(path))
+    try:
+        image.modify_exif({"Exif.Image.ImageDescription": TEST_STRING})
+        image.modify_xmp({"Xmp.dc.description": {'lang="x-default"': TEST_STRING}})
+    finally:
+        image.close()
+
+
+def ascii_entry(byte_order: str, data: bytes, value_offset: int) -> bytes:
+    """IFD entry for ImageDescription; values of 4 bytes or less live in the entry itself."""
+    if len(data) <= 4:
+        value_field = data.ljust(4, b"\0")
+    else:
+        value_field = struct.pack(byte_order + "I", value_offset)
+    return struct.pack(byte_order + "HHI", IMAGE_DESCRIPTION_TAG, TIFF_ASCII, len(data)) + value_field
+
+
+def append_aligned(segment: bytearray, blob: bytes) -> int:
+    """Append ``blob`` to the APP1 segment at a word boundary and return its TIFF offset."""
+    if (len(segment) - TIFF_START) & 1:
+        segment.append(0)
+    offset = len(segment) - TIFF_START
+    segment += blob
+    return offset
+
+
+def patch_jpeg_image_description(path: Path, value: bytes) -> None:
+    """Set the IFD0 ImageDescription of a JPEG to ``value``, adding the tag if needed.
+
+    A value that fits the old slot is patched in place. Otherwise the APP1
+    segment is rebuilt by appending to the end of its TIFF block, which keeps
+    every other offset valid: a longer value goes there, and so does a copy
+    of IFD0 with the tag sorted in when it was missing (the old IFD0 is left
+    unreferenced). A JPEG without EXIF gets a new APP1 segment after SOI and
+    any JFIF APP0. The rebuilt segment is spliced back into the file.
+    """
+    data = value + b"\0"
+    with open(path, "r+b") as f:
+        # mmap refuses zero-length files
+        if os.fstat(f.fileno()).st_size < 4:
+            raise ValueError("not a JPEG file (too short)")
+        with mmap.mmap(f.fileno(), 0) as mm:
+            if mm[:2] != b"\xff\xd8":
+                raise ValueError("not a JPEG file (no SOI marker)")
+            off = insert_at = 2
+            exif_at = None
+            while off + 4 <= len(mm):
+                marker, length = JPEG_SEGMENT.unpack_from(mm, off)
+                if marker == 0xFFDA or marker & 0xFF00 != 0xFF00:  # image data starts
+                    break
+                if marker == 0xFFE1 and mm[off + 4:off + 10] == EXIF_HEADER:
+                    exif_at = off
+                    break
+                if marker == 0xFFE0 and off == 2:
+                    insert_at = 2 + 2 + length  # JFIF APP0 must stay first
+                off += 2 + length
+
+            if exif_at is None:
+                # Start from an empty little-endian IFD0; the tag is added below
+                start = end = insert_at
+                segment = bytearray(
+                    JPEG_SEGMENT.pack(0xFFE1, 0) + EXIF_HEADER + b"II*\0" + struct.pack("<IHI", 8, 0, 0)
+                )
+            else:
+                start, end = exif_at, exif_at + 2 + length
+                segment = bytearray(mm[start:end])
+
+            byte_order = {b"II": "<", b"MM": ">"}.get(bytes(segment[TIFF_START:TIFF_START + 2]))
+            if byte_order is None:
+                raise ValueError("bad TIFF byte order mark")
+            entry = struct.Struct(byte_order + "HHII")  # tag, type, count, value/offset
+            ifd0 = TIFF_START + struct.unpack_from(byte_order + "I", segment, TIFF_START + 4)[0]
+            (entry_count,) = struct.unpack_from(byte_order + "H", segment, ifd0)
+            entries = [bytes(segment[ifd0 + 2 + 12 * i:ifd0 + 14 + 12 * i]) for i in range(entry_count)]
+            tags = [entry.unpack(raw)[0] for raw in entries]
+
+            if IMAGE_DESCRIPTION_TAG in tags:
+                entry_off = ifd0 + 2 + 12 * tags.index(IMAGE_DESCRIPTION_TAG)
+                _, tag_type, count, value_offset = entry.unpack_from(segment, entry_off)
+                if tag_type != TIFF_ASCII:
+                    raise ValueError(f"unexpected ImageDescription type {tag_type}")
+                if len(data) <= 4 or count >= len(data):
+                    # Fits without growing the segment: inline in the entry, or over the old value
+                    if len(data) <= 4:
+                        segment[entry_off:entry_off + 12] = ascii_entry(byte_order, data, 0)
+                    else:
+                        slot = TIFF_START + value_offset
+                        segment[slot:slot + count] = data.ljust(count, b"\0")
+                        struct.pack_into(byte_order + "I", segment, entry_off + 4, len(data))
+                    mm[start:end] = segment
+                    mm.flush()
+                    return
+                value_offset = append_aligned(segment, data)
+                segment[entry_off:entry_off + 12] = ascii_entry(byte_order, data, value_offset)
+            else:
+                next_ifd = bytes(segment[ifd0 + 2 + 12 * entry_count:ifd0 + 6 + 12 * entry_count])
+                new_ifd0 = append_aligned(segment, b"")
+                value_offset = new_ifd0 + 2 + 12 * (entry_count + 1) + 4
+                entries.insert(bisect.bisect(tags, IMAGE_DESCRIPTION_TAG), ascii_entry(byte_order, data, value_offset))
+                segment += struct.pack(byte_order + "H", entry_count + 1) + b"".join(entries) + next_ifd
+                if len(data) > 4:
+                    segment += data
+                struct.pack_into(byte_order + "I", segment, TIFF_START + 4, new_ifd0)
+
+            if len(segment) - 2 > 0xFFFF:
+                raise ValueError("APP1 segment would exceed 64 KiB")
+            JPEG_SEGMENT.pack_into(segment, 0, 0xFFE1, len(segment) - 2)
+            head, tail = mm[:start], mm[end:]
+    with open(path, "wb") as f:
+        f.write(head + segment + tail)
+
+
+def write_in_process(writer: str, path: Path) -> subprocess.CompletedProcess:
+    """Run an in-process writer, reported like an exiftool run."""
+    try:
+        if writer == "pyexiv2":
+            write_with_pyexiv2(path)
+        else:
+            patch_jpeg_image_description(path, EXPECTED_UTF8)
+    except Exception as exc:  # pyexiv2 raises plain RuntimeError/ValueError subclasses
+        return subprocess.CompletedProcess([writer], 1, b"", str(exc).encode("utf-8"))
+    return subprocess.CompletedProcess([writer], 0, b"", b"")
+
+
+class CaseResult(NamedTuple):
+    report: str
+    exif_bytes: Optional[bytes]  # None when the write failed
+    xmp_bytes: Optional[bytes]
+
+
+def run_case(case: Case, work_dir: Path, pristine_image: Path, daemon: ExifToolDaemon) -> CaseResult:
+    """Write the test string to a fresh link of the pristine image, then read back and check.
+
+    The write goes through ``daemon`` unless the case is about how arguments
+    survive the command line itself. The report is returned instead of
+    printed, so parallel cases don't interleave.
+    """
+    # Hardlinking is safe because -overwrite_original writes a new file and renames
+    # it over the link, so the pristine copy itself is never modified. The
+    # in-process writers modify the file they open, so they get a real copy.
+    test_file = work_dir / f"{case.name}.jpg"
+    if case.writer == "exiftool":
+        link_or_copy(pristine_image, test_file)
+    else:
+        shutil.copy(pristine_image, test_file)
+    args = list(case.args)
+    if case.argfile is not None:
+        argfile = write_argfile(work_dir, case.argfile, bom=case.bom)
+        args = ["-@", str(argfile)] + args
+
+    lines = []
+    report = lines.append
+    report(f"\n{'='*70}")
+    report(f"TEST: {case.description}")
+    if case.writer == "exiftool":
+        report(f"Command: exiftool {' '.join(str(a) for a in args)}")
+    else:
+        report(f"Command: {IN_PROCESS_COMMANDS[case.writer]}")
+    report('='*70)
+    if case.writer == "pyexiv2" and pyexiv2 is None:
+        report("SKIPPED: pyexiv2 is not installed")
+        return CaseResult("\n".join(lines), None, None)
+
+    # Write and both read-backs travel to the daemon in a single round trip;
+    # the reads are only used if the write succeeded
+    write_args = ["-overwrite_original"] + args + [str(test_file)]
+    read_args = []
+    native_exif = piexif is not None and not VERIFY_WITH_EXIFTOOL
+    if not native_exif:
+        read_args.append(["-b", "-ImageDescription", str(test_file)])
+    if VERIFY_WITH_EXIFTOOL:
+        read_args.append(["-b", "-XMP:Description", str(test_file)])
+    if case.writer != "exiftool":
+        write_result = write_in_process(case.writer, test_file)
+        read_results = daemon.execute_many(read_args)
+    elif case.command_line:
+        # Only stderr is reported on failure, so stdout is not captured at all
+        write_result = run_one_shot(write_args)
+        read_results = daemon.execute_many(read_args)
+    else:
+        write_result, *read_results = daemon.execute_many([write_args] + read_args)
+    if write_result.returncode != 0:
+        report(f"WRITE FAILED: {write_result.stderr}")
+        return CaseResult("\n".join(lines), None, None)
 
     # Check raw bytes of ImageDescription
-    result = subprocess.run(
-        ["exiftool", "-b", "-ImageDescription", str(test_file)],
-        capture_output=True
-    )
-    raw_bytes = result.stdout
-    print(f"ImageDescription raw bytes (hex): {raw_bytes.hex()}")
-
-    # Check if it matches expected UTF-8
-    expected_utf8 = TEST_STRING.encode('utf-8')
-    if raw_bytes == expected_utf8:
-        print("SUCCESS: BYTES MATCH EXPECTED UTF-8!")
+    raw_bytes = read_image_description(test_file) if native_exif else read_results[0].stdout
+
+    # Check if it matches expected UTF-8; on a match the hex is already known
+    if raw_bytes == EXPECTED_UTF8:
+        report(f"ImageDescription raw bytes (hex): {EXPECTED_HEX}")
+        report("SUCCESS: BYTES MATCH EXPECTED UTF-8!")
     else:
-        print(f"FAIL: BYTES DON'T MATCH")
-        print(f"  Expected: {expected_utf8.hex()}")
-        print(f"  Got:      {raw_bytes.hex()}")
+        raw_hex = raw_bytes.hex()
+        report(f"ImageDescription raw bytes (hex): {raw_hex}")
+        report("FAIL: BYTES DON'T MATCH")
+        report(f"  Expected: {EXPECTED_HEX}")
+        report(f"  Got:      {raw_hex}")
 
     # Also check XMP
-    result = subprocess.run(
-        ["exiftool", "-b", "-XMP:Description", str(test_file)],
-        capture_output=True
-    )
-    if result.stdout:
-        print(f"XMP:Description raw bytes (hex): {result.stdout.hex()}")
-        if result.stdout == expected_utf8:
-            print("SUCCESS: XMP BYTES MATCH EXPECTED UTF-8!")
-
-
-# Test 1: Current approach (what we have now) - likely fails on Windows
-test1 = make_test_copy("test1_current")
-run_exiftool_and_check(
-    ["-charset", "utf8", f"-ImageDescription={TEST_STRING}", f"-Description={TEST_STRING}"],
-    test1,
-    "Current approach: -charset utf8 (command line)"
-)
+    xmp_bytes = read_results[-1].stdout if VERIFY_WITH_EXIFTOOL else read_xmp_description(test_file)
+    if xmp_bytes == EXPECTED_UTF8:
+        report(f"XMP:Description raw bytes (hex): {EXPECTED_HEX}")
+        report("SUCCESS: XMP BYTES MATCH EXPECTED UTF-8!")
+    elif xmp_bytes:
+        report(f"XMP:Description raw bytes (hex): {xmp_bytes.hex()}")
 
-# Test 2: Using argfile with UTF-8 BOM
-test2 = make_test_copy("test2_argfile_bom")
-argfile = temp_dir / "args_bom.txt"
-with open(argfile, 'w', encoding='utf-8-sig') as f:  # UTF-8 with BOM
-    f.write(f"-ImageDescription={TEST_STRING}\n")
-    f.write(f"-Description={TEST_STRING}\n")
-run_exiftool_and_check(
-    ["-@", str(argfile)],
-    test2,
-    "Using argfile (-@) with UTF-8 BOM"
-)
+    return CaseResult("\n".join(lines), raw_bytes, xmp_bytes)
 
-# Test 3: Using argfile without BOM but with -charset
-test3 = make_test_copy("test3_argfile_charset")
-argfile3 = temp_dir / "args_charset.txt"
-with open(argfile3, 'w', encoding='utf-8') as f:
-    f.write(f"-charset\n")
-    f.write(f"filename=utf8\n")
-    f.write(f"-ImageDescription={TEST_STRING}\n")
-    f.write(f"-Description={TEST_STRING}\n")
-run_exiftool_and_check(
-    ["-@", str(argfile3)],
-    test3,
-    "Using argfile with -charset in file"
-)
 
-# Test 4: Write to XMP only
-test4 = make_test_copy("test4_xmp_only")
-argfile4 = temp_dir / "args_xmp.txt"
-with open(argfile4, 'w', encoding='utf-8-sig') as f:
-    f.write(f"-XMP:Description={TEST_STRING}\n")
-run_exiftool_and_check(
-    ["-@", str(argfile4)],
-    test4,
-    "XMP only via argfile"
-)
+if pytest is not None:
+
+    @pytest.fixture(scope="session")
+    def source_image() -> Path:
+        if shutil.which("exiftool") is None:
+            pytest.skip("exiftool not found in PATH")
+        image = find_source_image()
+        if image is None:
+            pytest.skip(f"no JPG test image in {TEST_DIR}")
+        return image
+
+    @pytest.fixture(scope="session")
+    def exiftool_daemon():
+        # One daemon per test session, i.e. per xdist worker
+        daemon = ExifToolDaemon()
+        yield daemon
+        daemon.close()
+
+    @pytest.mark.parametrize("case", CASES, ids=[case.name for case in CASES])
+    def test_write_encoding(case, source_image, exiftool_daemon, tmp_path):
+        if case.writer == "pyexiv2" and pyexiv2 is None:
+            pytest.skip("pyexiv2 is not installed")
+        pristine_image = tmp_path / "pristine.jpg"
+        link_or_copy(source_image, pristine_image)
+        result = run_case(case, tmp_path, pristine_image, exiftool_daemon)
+        assert result.exif_bytes is not None, result.report
+        if case.checks_exif:
+            assert result.exif_bytes == EXPECTED_UTF8, result.report
+        else:
+            assert result.xmp_bytes == EXPECTED_UTF8, result.report
+
+
+def main() -> None:
+    source_image = find_source_image()
+    if source_image is None:
+        print(f"No JPG test image found in {TEST_DIR}")
+        sys.exit(1)
+
+    print(f"Source image: {source_image}")
+    print(f"Test string: {TEST_STRING}")
+    print(f"Test string UTF-8 hex: {EXPECTED_HEX}")
+    print()
+
+    # Create temp copies for each test; kept after the run so they can be inspected
+    temp_dir = Path(tempfile.mkdtemp(dir=scratch_root()))
+    print(f"Temp dir: {temp_dir}")
+
+    # The source image is copied into temp_dir once; every test file links to this copy,
+    # so at most one full copy is made even when the source sits on another filesystem
+    pristine_image = temp_dir / "pristine.jpg"
+    link_or_copy(source_image, pristine_image)
+
+    # The cases touch separate files, so they run side by side; the reports are
+    # written in case order with a single write once every case has finished
+    try:
+        with ThreadPoolExecutor(max_workers=min(len(CASES), os.cpu_count() or 1)) as executor:
+            futures = [
+                executor.submit(lambda case: run_case(case, temp_dir, pristine_image, get_daemon()), case)
+                for case in CASES
+            ]
+            reports = [future.result().report for future in futures]
+        sys.stdout.write("".join(report + "\n" for report in reports))
+        sys.stdout.flush()
+    finally:
+        for daemon in daemons:
+            daemon.close()
+
+    print(f"\n{'='*70}")
+    print(f"Test files saved to: {temp_dir}")
+    print("Open these files in Lightroom to verify which encoding works!")
+    print('='*70)
 
-# Test 5: Combined approach - write to both EXIF and XMP via argfile
-test5 = make_test_copy("test5_combined")
-argfile5 = temp_dir / "args_combined.txt"
-with open(argfile5, 'w', encoding='utf-8-sig') as f:
-    f.write(f"-ImageDescription={TEST_STRING}\n")
-    f.write(f"-XMP:Description={TEST_STRING}\n")
-run_exiftool_and_check(
-    ["-@", str(argfile5)],
-    test5,
-    "Combined EXIF + XMP via argfile with BOM"
-)
 
-print(f"\n{'='*70}")
-print(f"Test files saved to: {temp_dir}")
-print("Open these files in Lightroom to verify which encoding works!")
-print('='*70)
+if __name__ == "__main__":
+    main()